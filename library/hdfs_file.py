@@ -24,6 +24,12 @@ description:
 version_added: "2.2"
 author: Antoine Pointeau (@apointeau)
 options:
+    concurrency:
+        description:
+            - Maximum number of `hdfs` processes run at once by a recursive
+            - chmod/chown, only used with method `command`.
+        type: int
+        default: 16
     group:
         description:
             - Name of the group that should own the
@@ -31,8 +37,13 @@ options:
     method:
         description:
             - If `command`, this module will manage with the hdfs CLI.
-            - If `library`, this module will use the python package `hdfs`.
-        default: command
+            - If `library`, this module will use the python package `hdfs`
+            - and keep a single WebHDFS connection for the whole run.
+            - The default changed from `command` to `library`, set
+            - `method: command` to keep the previous behavior.
+            - The `library` method does not support Kerberos, use
+            - `command` on secured clusters.
+        default: library
         choices:
             - command
             - library
@@ -40,8 +51,9 @@ options:
         description:
             - Mode the file or directory should be. For those used to
             - /usr/bin/chmod remember that modes are actually octal numbers
-            - (eg. 0644). Noe the this fonction will always set changed
-            - due to CLI limitation (cannot get file mode)
+            - (eg. 0644). The mode is compared as an octal number, so
+            - 0755 and 755 are the same mode. An unquoted YAML 0755 is
+            - also accepted. Symbolic modes (eg. g+w) are not supported.
     owner:
         description:
             - Name of the user that should own the
@@ -56,12 +68,25 @@ options:
     recurse:
         description:
             - The module will recursively set the specified file
-            - attributes (applies only to state=directory)
+            - attributes (applies only to state=directory). It is ignored
+            - with a warning when the path is not a directory. The content
+            - is always checked, only the entries that differ are changed.
+        type: bool
+        default: false
     replication:
         description:
             - The replication factor of a file/directory, please
             - not that setting the replication on a directory is
             - always apply recursivly.
+    url:
+        description:
+            - The WebHDFS url of the NameNode (eg. http://namenode:9870),
+            - only used with method `library`. Several urls can be
+            - separated by `;` for HA clusters. When omitted, it is read
+            - from the host hadoop config (`dfs.namenode.http-address`, or
+            - the `dfs.nameservices` HA keys, https with `dfs.http.policy`
+            - HTTPS_ONLY). The module fails if no address is set or if it
+            - is a wildcard (eg. 0.0.0.0).
     state:
         description:
             - If `directory`, all immediate subdirectories will
@@ -70,13 +95,17 @@ options:
             - If `file`, the file will NOT be created if it does not exist,
             - see the `hdfs_copy` module if you want that behavior.
             - If `absent`, directories will be recursively deleted,
-            - and files will be unlinked. Note that `hdfs_file` will not fail
-            - if the path does not exist as the state did not change.
+            - and files will be unlinked. Like `hdfs dfs -rm`, they are
+            - moved to the trash when `fs.trash.interval` is positive, with
+            - method `library` this needs Hadoop 2.9+ and the hadoop config
+            - on the host, otherwise the deletion is permanent. Note that
+            - `hdfs_file` will not fail if the path does not exist as the
+            - state did not change.
             - If `touch`, an empty file will be created if the path does
             - not exist, while an existing file will receive updated file
-            - access and modification times (directories stay untouch). Please
-            - note that touch update file owner, group, mode and replication,
-            - you should set this param explicitly to replace them.
+            - access and modification times (directories stay untouch). The
+            - owner, group, mode and replication are then only changed if
+            - they differ from the requested ones.
         default: file
         choices:
             - directory
@@ -84,8 +113,11 @@ options:
             - absent
             - touch
 notes:
-    - check_mode supported
-    - method `library` not yet supported
+    - check_mode supported, with recurse only the given path itself is
+      checked, not its content
+requirements:
+    - python >= 3.5
+    - hdfs (python package, for method `library`)
 """
 
 EXAMPLES = """
@@ -110,31 +142,33 @@ EXAMPLES = """
 
 """
 
-import sys
-
 from ansible.module_utils.basic import AnsibleModule
 
 from ansible.module_utils.cyres.HdfsUtils import (
     HdfsUtilsError,
+    HdfsContextCli,
+    HdfsContextLib,
     HdfsCheckMode
 )
 
 def build_module():
     argument_spec = dict(
+        concurrency = dict(default=16, required=False, type="int"),
         group       = dict(default=None, required=False),
         method      = dict(
-            default="command", required=False,
+            default="library", required=False,
             choices=["command", "library"]
         ),
-        mode        = dict(default=None, required=False),
+        mode        = dict(default=None, required=False, type="raw"),
         owner       = dict(default=None, required=False),
         path        = dict(aliases=["dest", "name"], required=True),
-        recurse     = dict(default=None, required=False),
+        recurse     = dict(default=False, required=False, type="bool"),
         replication = dict(default=None, required=False),
         state       = dict(
             default="file", required=False,
             choices=["file", "directory", "touch", "absent"]
         ),
+        url         = dict(default=None, required=False),
     )
     mutually_exclusive = []
     module = AnsibleModule(
@@ -148,29 +182,53 @@ def build_module():
 def resolv_states(module, params, context, status):
     old = status["state"]
     new = params["state"]
+    path = params["path"]
+    transitions = {
+        ("absent", "directory"): lambda: context.mkdir(path, parent=True),
+        ("absent", "touch"): lambda: context.touch(path),
+        ("file", "touch"): lambda: context.touch(path),
+        ("file", "absent"): lambda: context.remove(path),
+        ("directory", "absent"): lambda: context.remove(path, recurse=True),
+    }
+    if (old, new) == ("absent", "file"):
+        module.fail_json(msg="no such file, to create new file use state 'touch' instead of 'file'")
+    if (old, new) not in transitions:
+        module.fail_json(msg="unsupported state convert '%s' -> '%s'" % (old, new))
     try:
-        if old == "absent" and new == "file":
-            module.fail_json(msg="no such file, to create new file use state 'touch' instead of 'file'")
-        elif old == "absent" and new == "directory":
-            context.mkdir(params["path"], parent=True)
-        elif new == "touch" and old in ["absent", "file"]:
-            context.touch(params["path"])
-        elif new == "absent" and old == "file":
-            context.remove(params["path"])
-        elif new == "absent" and old == "directory":
-            context.remove(params["path"], recurse=True)
-        else:
-            module.fail_json(msg="unsupported state convert '%s' -> '%s'" % (old, new))
+        transitions[(old, new)]()
     except HdfsUtilsError as e:
-        module.fail_json(msg=e)
-    return True
+        module.fail_json(msg=str(e))
+    # Project the new status instead of asking the NameNode again
+    status["state"] = "file" if new == "touch" else new
+    if old == "absent":  # Fresh path, force the attributes checks
+        for key in ["owner", "group", "replication", "mode"]:
+            status[key] = None
+    return status
+
+
+def normalize_mode(module, mode):
+    """
+    Return :mode: as an octal string. A YAML unquoted 0755 is read as the
+    int 493, it is converted back to "755" like the Ansible file module.
+    """
+    if mode is None:
+        return None
+    if isinstance(mode, int):
+        return "%o" % mode
+    try:
+        int(str(mode), 8)
+    except ValueError:
+        module.fail_json(msg="mode must be an octal number, got '%s'" % mode)
+    return str(mode)
 
 
 def should_modify(status, params, value):
     if params[value] is None:
         return False
-    if params["state"] == "touch":
+    if status[value] is None:
         return True
+    if value == "mode":  # Compare octal numbers, "0755" equals "755"
+        return int(str(status[value]), 8) != int(str(params[value]), 8)
     if str(status[value]) == str(params[value]):
         return False
     return True
@@ -179,39 +237,53 @@ def should_modify(status, params, value):
 def main():
     module = build_module()
     params = module.params
+    params["mode"] = normalize_mode(module, params["mode"])
     changed = False
 
-    if params["method"] == "command":
-        context = HdfsContextCli()
-    elif params["method"] == "library":
-        # context = HdfsContextLib()
-        module.fail_json(msg="Not yet implemented")
+    try:
+        if params["method"] == "command":
+            context = HdfsContextCli(concurrency=params["concurrency"])
+            if context.shell_error:
+                module.warn("in-process FsShell disabled, %s" % context.shell_error)
+        elif params["method"] == "library":
+            context = HdfsContextLib(params["url"])
+    except HdfsUtilsError as e:
+        module.fail_json(msg=str(e))
     if module.check_mode:  # Neutralize context fonctions
         context = HdfsCheckMode(context)
 
-    status = context.stats(params["path"])
+    try:
+        status = context.stats(params["path"])
+    except HdfsUtilsError as e:
+        module.fail_json(msg=str(e))
+    if params["state"] == "absent" and status["state"] == "absent":
+        module.exit_json(changed=False)
     # STATE
     if status["state"] != params["state"]:
         changed = True
-        resolv_states(module, params, context, status)
+        status = resolv_states(module, params, context, status)
     if params["state"] == "absent":
         module.exit_json(changed=changed)
-    # OWNER
-    if should_modify(status, params, "owner"):
-        changed = True
-        context.chown(params["path"], owner=params["owner"], recurse=params["recurse"])
-    # GROUP
-    if should_modify(status, params, "group"):
-        changed = True
-        context.chown(params["path"], group=params["group"], recurse=params["recurse"])
-    # REPLICATION
-    if should_modify(status, params, "replication"):
-        changed = True
-        context.setrep(params["path"], params["replication"])
-    # MODE
-    if params["mode"] is not None:
+    # OWNER, GROUP, REPLICATION, MODE
+    recurse = params["recurse"] and status["state"] == "directory"
+    if params["recurse"] and not recurse:
+        module.warn("recurse ignored, '%s' is not a directory" % params["path"])
+    pending = {}
+    for key in ["owner", "group", "replication", "mode"]:
+        if should_modify(status, params, key):
+            pending[key] = params[key]
+    if pending:
         changed = True
-        context.chmod(params["path"], params["mode"], recurse=params["recurse"])
+    if recurse:  # The content may differ even if the path is up to date
+        for key in ["owner", "group", "mode"]:
+            if params[key] is not None:
+                pending[key] = params[key]
+    if pending:
+        try:
+            if context.apply_batch(params["path"], recurse=recurse, **pending):
+                changed = True
+        except HdfsUtilsError as e:
+            module.fail_json(msg=str(e))
 
     module.exit_json(changed=changed)
 
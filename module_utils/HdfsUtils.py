@@ -28,6 +28,7 @@ All Exception will be raised with the class `HdfsUtilsError` but
 the common usage is to catch `HdfsUtilsError`.
 
 Public methods short descriptions:
+- apply_batch: change several file/directory attributes at once
 - chmod: change file/directory right mode
 - chown: change file/directory owner/group
 - mkdir: create a directory
@@ -37,31 +38,234 @@ Public methods short descriptions:
 - touch: create file or update file access
 """
 
-import re
-from subprocess import Popen, PIPE
+import posixpath
+import shutil
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from subprocess import run, DEVNULL, PIPE
+
+# Absolute path of the CLI, resolved once when the module is imported
+_HDFS_BIN = shutil.which("hdfs") or "/bin/hdfs"
+
+
+def _symbolic_to_octal(perms):
+    """
+    Convert the symbolic permissions printed by `hdfs dfs -ls`
+    (eg. "drwxr-xr-t") to an octal number, the sticky bit included.
+    """
+    mode = 0
+    for char in perms[1:10]:
+        mode = (mode << 1) | (char not in "-ST")
+    if perms[9:10] in ("t", "T"):
+        mode |= 0o1000
+    return (mode)
 
 
 class HdfsContextCli:
 
-    def __init__(self, command="/bin/hdfs"):
+    # Stats shared by all instances of the process,
+    # {(command, path): (result, time)}
+    _stats_cache = OrderedDict()
+    _stats_cache_size = 1024
+    _stats_cache_ttl = 5
+
+    def __init__(self, command=_HDFS_BIN, concurrency=16):
         """
-        The param :command: allow to change the CLI path, it's not common
-        to set this parameter.
+        The param :command: allow to change the CLI path, by default the
+        `hdfs` found in the PATH is used (or /bin/hdfs). The param
+        :concurrency: bounds the number of `hdfs` processes run at once by
+        the recursive operations.
         """
         self.cmd = command
+        self.concurrency = max(1, int(concurrency))
+        self._written = 0  # Entries changed by chmod, chown and setrep
+        self._argv_chmod = (command, "dfs", "-chmod")
+        self._argv_chown = (command, "dfs", "-chown")
+        self._argv_ls_r = (command, "dfs", "-ls", "-R")
+        self._argv_mkdir = (command, "dfs", "-mkdir")
+        self._argv_mkdir_p = (command, "dfs", "-mkdir", "-p")
+        self._argv_rm = (command, "dfs", "-rm")
+        self._argv_rm_r = (command, "dfs", "-rm", "-r")
+        self._argv_setrep = (command, "dfs", "-setrep")
+        self._argv_stat = (command, "dfs", "-stat")
+        self._argv_touchz = (command, "dfs", "-touchz")
+        self.shell_error = None  # Why the in-process FsShell is not used
+        self._shell = self._load_shell()
+
+    def _load_shell(self):
+        """
+        Return an in-process FsShell driven through pyjnius, so the JVM is
+        started once for the whole run. Return None when pyjnius is not
+        installed or the FsShell cannot be loaded (the reason is kept in
+        `shell_error`), `hdfs dfs` is then spawned for each call.
+        """
+        try:
+            import jnius_config
+        except ImportError:  # pyjnius not installed
+            return (None)
+        if not jnius_config.vm_running:
+            # The JVM started through JNI does not expand classpath wildcards
+            out, err, rc = self._spawn((self.cmd, "classpath", "--glob"))
+            if rc != 0:
+                self.shell_error = "hdfs classpath --glob failed: %s" % err.decode()
+                return (None)
+            jnius_config.add_classpath(*out.decode().strip().split(":"))
+        try:
+            import jnius
+        except (ImportError, SystemError) as e:  # No libjvm or JVM start failed
+            self.shell_error = "cannot start the JVM: %s" % e
+            return (None)
+        try:
+            conf = jnius.autoclass("org.apache.hadoop.hdfs.HdfsConfiguration")()
+            shell = jnius.autoclass("org.apache.hadoop.fs.FsShell")(conf)
+        except jnius.JavaException as e:
+            self.shell_error = "cannot load FsShell: %s" % e
+            return (None)
+        self._System = jnius.autoclass("java.lang.System")
+        self._PrintStream = jnius.autoclass("java.io.PrintStream")
+        self._ByteArrayOutputStream = jnius.autoclass("java.io.ByteArrayOutputStream")
+        return (shell)
+
+    def _run(self, cmd):
+        """
+        Run the command :cmd: and return its (stdout, stderr, returncode).
+        The `hdfs dfs` commands are run by the in-process FsShell when it
+        is available.
+        """
+        if self._shell is None or cmd[:2] != (self.cmd, "dfs"):
+            return (self._spawn(cmd))
+        out, err = self._ByteArrayOutputStream(), self._ByteArrayOutputStream()
+        old_out, old_err = self._System.out, self._System.err
+        self._System.setOut(self._PrintStream(out, True))
+        self._System.setErr(self._PrintStream(err, True))
+        try:
+            rc = self._shell.run(list(cmd[2:]))
+        finally:
+            self._System.setOut(old_out)
+            self._System.setErr(old_err)
+        return (out.toString("UTF-8").encode(), err.toString("UTF-8").encode(), rc)
+
+    def _spawn(self, cmd):
+        """
+        Run the command :cmd: in a subprocess and return its (stdout,
+        stderr, returncode).
+        """
+        proc = run(cmd, stdin=DEVNULL, stdout=PIPE, stderr=PIPE)
+        return (proc.stdout, proc.stderr, proc.returncode)
+
+    def _invalidate(self, path):
+        """
+        Drop the cached stats of :path:, its parent and its content.
+        """
+        path = path.rstrip("/") or "/"
+        parent = posixpath.dirname(path)
+        prefix = path.rstrip("/") + "/"
+        for key in list(self._stats_cache):
+            cmd, cached = key
+            if cmd == self.cmd and (cached in (path, parent) or cached.startswith(prefix)):
+                del self._stats_cache[key]
+
+    def _parallel_recurse(self, path, jobs):
+        """
+        Apply several :jobs: on :path: and all its content. The tree is
+        listed once (stats for :path:, `-ls -R` for the content), each job
+        is a (argv, args, skip) tuple where :argv: is a command prefix
+        (eg. `_argv_chmod`) and the entries for which :skip: returns True
+        (called with their octal mode, owner and group) are already up to
+        date. The remaining entries of all jobs are spread in chunks over
+        at most `concurrency` parallel processes.
+        """
+        entries = []
+        status = self.stats(path)  # `-ls -R` does not list :path: itself
+        if status["state"] != "absent":
+            entries.append((path, int(status["mode"], 8), status["owner"], status["group"]))
+        cmd = (*self._argv_ls_r, path)
+        out, err, rc = self._run(cmd)
+        if rc != 0:
+            raise HdfsUtilsError("subprocess ls stderr: %s" % err.decode())
+        for line in out.decode().splitlines():
+            fields = line.split(None, 7)
+            if len(fields) != 8:  # Not an entry line
+                continue
+            entries.append((fields[7], _symbolic_to_octal(fields[0]), fields[2], fields[3]))
+        commands = []
+        for argv, args, skip in jobs:
+            targets = [entry[0] for entry in entries if not skip(*entry[1:])]
+            size = min(len(targets) // self.concurrency + 1, 1000)  # Bound argv length
+            commands.extend(
+                (*argv, *args, *targets[idx:idx + size])
+                for idx in range(0, len(targets), size)
+            )
+            self._written += len(targets)
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            for cmd, (out, err, rc) in zip(commands, pool.map(self._spawn, commands)):
+                if rc != 0:
+                    raise HdfsUtilsError("subprocess %s stderr: %s" % (cmd[2][1:], err.decode()))
+        self._invalidate(path)
+        return (self)
+
+    def _chmod_job(self, mode):
+        """
+        Return the `_parallel_recurse` job that sets :mode:.
+        """
+        try:
+            wanted = int(mode, 8) & 0o1777
+        except ValueError:
+            raise HdfsUtilsError("chmod expects an octal mode, got '%s'" % mode)
+        return (self._argv_chmod, (mode,),
+                lambda e_mode, e_owner, e_group: e_mode == wanted)
+
+    def _chown_job(self, owner, group):
+        """
+        Return the `_parallel_recurse` job that sets :owner: and :group:.
+        """
+        target = "%s%s" % (owner or "", ":" + group if group else "")
+        return (self._argv_chown, (target,),
+                lambda e_mode, e_owner, e_group: (owner in (None, e_owner) and
+                                                  group in (None, e_group)))
+
+    def apply_batch(self, path, mode=None, owner=None, group=None,
+                    replication=None, recurse=None):
+        """
+        Apply all the given attributes to :path: in one call, unset ones
+        are skipped. The :owner: and :group: are merged into a single
+        chown. With :recurse: the tree is listed only once for both chown
+        and chmod, the entries already up to date are left untouched.
+        Return True if at least one entry was changed.
+        """
+        written = self._written
+        if recurse:
+            jobs = []
+            if owner or group:
+                jobs.append(self._chown_job(owner, group))
+            if mode is not None:
+                jobs.append(self._chmod_job(mode))
+            if jobs:
+                self._parallel_recurse(path, jobs)
+        else:
+            if owner is not None or group is not None:
+                self.chown(path, owner=owner, group=group)
+            if mode is not None:
+                self.chmod(path, mode)
+        if replication is not None:
+            self.setrep(path, replication)
+        return (self._written != written)
 
     def chmod(self, path, mode, recurse=None):
         """
         Change the :mode: of the given :path:. The param :mode: needs to
         be a string representation of an octal number (eg. "0744")
         """
-        cmd = [self.cmd, "dfs", "-chmod", mode, path]
+        job = self._chmod_job(mode)
         if recurse:
-            cmd.insert(3, "-R")
-        proc = Popen(cmd, stdin=PIPE, stdout=PIPE, stderr=PIPE)
-        out, err = proc.communicate()
-        if proc.wait() is not 0:
-            raise HdfsUtilsError("subprocess chmod stderr: %s" % err)
+            return (self._parallel_recurse(path, [job]))
+        self._invalidate(path)
+        cmd = (*self._argv_chmod, mode, path)
+        out, err, rc = self._run(cmd)
+        if rc != 0:
+            raise HdfsUtilsError("subprocess chmod stderr: %s" % err.decode())
+        self._written += 1
         return (self)
 
     def chown(self, path, owner=None, group=None, recurse=None):
@@ -70,14 +274,17 @@ class HdfsContextCli:
         :recurse: apply the changes for all subfiles and subfolders inside
         the give :path:. (should be a directory)
         """
-        target = owner if owner else "" + ":" + group if group else ""
-        cmd = [self.cmd, "dfs", "-chown", target, path]
+        if not owner and not group:  # Nothing to change
+            return (self)
+        job = self._chown_job(owner, group)
         if recurse:
-            cmd.insert(3, "-R")
-        proc = Popen(cmd, stdin=PIPE, stdout=PIPE, stderr=PIPE)
-        out, err = proc.communicate()
-        if proc.wait() is not 0:
-            raise HdfsUtilsError("subprocess chown stderr: %s" % err)
+            return (self._parallel_recurse(path, [job]))
+        self._invalidate(path)
+        cmd = (*job[0], *job[1], path)
+        out, err, rc = self._run(cmd)
+        if rc != 0:
+            raise HdfsUtilsError("subprocess chown stderr: %s" % err.decode())
+        self._written += 1
         return (self)
 
     def mkdir(self, path, parent=False):
@@ -86,13 +293,11 @@ class HdfsContextCli:
         if immediate subdirectories should be created too. This method
         raises an HdfsUtilsError if the command failed.
         """
-        cmd = [self.cmd, "dfs", "-mkdir", path]
-        if parent:
-            cmd.insert(3, "-p")
-        proc = Popen(cmd, stdin=PIPE, stdout=PIPE, stderr=PIPE)
-        out, err = proc.communicate()
-        if proc.wait() is not 0:
-            raise HdfsUtilsError("subprocess mkdir stderr: %s" % err)
+        self._invalidate(path)
+        cmd = (*(self._argv_mkdir_p if parent else self._argv_mkdir), path)
+        out, err, rc = self._run(cmd)
+        if rc != 0:
+            raise HdfsUtilsError("subprocess mkdir stderr: %s" % err.decode())
         return (self)
 
     def remove(self, path, recurse=False):
@@ -101,13 +306,11 @@ class HdfsContextCli:
         allows to force delete directories and its content. This method
         raises an HdfsUtilsError if the command failed.
         """
-        cmd = [self.cmd, "dfs", "-rm", path]
-        if recurse:
-            cmd.insert(3, "-r")
-        proc = Popen(cmd, stdin=PIPE, stdout=PIPE, stderr=PIPE)
-        out, err = proc.communicate()
-        if proc.wait() is not 0:
-            raise HdfsUtilsError("subprocess rm stderr: %s" % err)
+        self._invalidate(path)
+        cmd = (*(self._argv_rm_r if recurse else self._argv_rm), path)
+        out, err, rc = self._run(cmd)
+        if rc != 0:
+            raise HdfsUtilsError("subprocess rm stderr: %s" % err.decode())
         return (self)
 
     def setrep(self, path, factor):
@@ -116,11 +319,12 @@ class HdfsContextCli:
         :factor: is expected to be a number. Please not that the CLI always
         apply the factor recursivly on directories.
         """
-        cmd = [self.cmd, "dfs", "-setrep", factor, path]
-        proc = Popen(cmd, stdin=PIPE, stdout=PIPE, stderr=PIPE)
-        out, err = proc.communicate()
-        if proc.wait() is not 0:
-            raise HdfsUtilsError("subprocess setrep stderr: %s" % err)
+        self._invalidate(path)
+        cmd = (*self._argv_setrep, str(factor), path)
+        out, err, rc = self._run(cmd)
+        if rc != 0:
+            raise HdfsUtilsError("subprocess setrep stderr: %s" % err.decode())
+        self._written += 1
         return (self)
 
     def stats(self, path):
@@ -132,20 +336,30 @@ class HdfsContextCli:
             "state": "absent",
             "owner": None,
             "group": None,
-            "replication": None
+            "replication": None,
+            "mode": None
         }
-        cmd = [self.cmd, "dfs", "-stat", "%F[SEP]%u[SEP]%g[SEP]%r", path]
-        proc = Popen(cmd, stdin=PIPE, stdout=PIPE, stderr=PIPE)
-        out, err = proc.communicate()
-        if proc.wait() is not 0:  # Assume no such file or directory
+        key = (self.cmd, path.rstrip("/") or "/")
+        cached = self._stats_cache.get(key)
+        if cached is not None and time.monotonic() - cached[1] < self._stats_cache_ttl:
+            self._stats_cache.move_to_end(key)
+            return (dict(cached[0]))
+        cmd = (*self._argv_stat, "%F[SEP]%u[SEP]%g[SEP]%r[SEP]%a", path)
+        out, err, rc = self._run(cmd)
+        if rc != 0:  # Assume no such file or directory
             return (result)
-        out = out.strip().split("[SEP]")
-        out_order = ["state", "owner", "group", "replication"]
-        for idx, key in enumerate(out_order):  # Fill the dict
-            result[key] = out[idx]
-        if result["state"] == "regular file":  # Normalize file string
-            result["state"] = "file"
-        result["replication"] = int(result["replication"])
+        state, owner, group, replication, mode = out.rstrip().split(b"[SEP]", 4)
+        result.update(
+            state=("file" if state == b"regular file" else state.decode()),  # Normalize file string
+            owner=owner.decode(),
+            group=group.decode(),
+            replication=int(replication),
+            mode=mode.decode()
+        )
+        self._stats_cache[key] = (dict(result), time.monotonic())
+        self._stats_cache.move_to_end(key)
+        if len(self._stats_cache) > self._stats_cache_size:
+            self._stats_cache.popitem(last=False)
         return (result)
 
     def touch(self, path):
@@ -154,11 +368,11 @@ class HdfsContextCli:
         updates file access and modification times. This method raises
         an HdfsUtilsError if the command failed.
         """
-        cmd = [self.cmd, "dfs", "-touchz", path]
-        proc = Popen(cmd, stdin=PIPE, stdout=PIPE, stderr=PIPE)
-        out, err = proc.communicate()
-        if proc.wait() is not 0:
-            raise HdfsUtilsError("subprocess touchz stderr: %s" % err)
+        self._invalidate(path)
+        cmd = (*self._argv_touchz, path)
+        out, err, rc = self._run(cmd)
+        if rc != 0:
+            raise HdfsUtilsError("subprocess touchz stderr: %s" % err.decode())
         return (self)
 
 # --------------------------------------------------------------------------- #
@@ -168,19 +382,311 @@ class HdfsContextCli:
 
 """
 This module give an hdfs context using library to manage the file system.
-All Exception will be raised with the class `HdfsContextLibError` but
-the common usage is to catch `HdfsUtilsError`.
+It relies on the python package `hdfs` (WebHDFS) and keeps a single client,
+so one module run reuses the same NameNode connection for every call.
+All Exception will be raised with the class `HdfsUtilsError`.
 
 Public methods short descriptions:
+- apply_batch: change several file/directory attributes at once
+- chmod: change file/directory right mode
+- chown: change file/directory owner/group
 - mkdir: create a directory
 - remove: delete a file/directory
+- setrep: set a file/directory replication factor
 - stats: get informations about a file/directory
 - touch: create file or update file access
 """
 
+from urllib.parse import urlparse
+
+try:
+    from hdfs import InsecureClient, HdfsError
+    from requests import Session
+    from requests.adapters import HTTPAdapter
+    from requests.exceptions import ConnectionError as HttpConnectionError
+    from urllib3.util.retry import Retry
+    HAS_HDFS = True
+except ImportError:
+    HAS_HDFS = False
+
 
 class HdfsContextLib:
-    raise NotImplementedError()
+
+    # Keep-alive sessions shared by all instances of the process,
+    # {((host, port), ...): Session}
+    _sessions = {}
+
+    def __init__(self, url=None):
+        """
+        The param :url: is the WebHDFS endpoint of the NameNode, it can
+        contains several urls separated by `;` for HA clusters. When it is
+        not set, it is read from `dfs.namenode.http-address` with
+        `hdfs getconf`.
+        """
+        if not HAS_HDFS:
+            raise HdfsUtilsError("the python package `hdfs` is required for method library")
+        self.url = url or self._default_url()
+        self._connect()
+
+    def _getconf(self, key):
+        """
+        Return the value of the hadoop configuration :key: on the host, or
+        None when it is not set or the CLI is not installed.
+        """
+        cmd = (_HDFS_BIN, "getconf", "-confKey", key)
+        try:
+            proc = run(cmd, stdin=DEVNULL, stdout=PIPE, stderr=PIPE)
+        except OSError:
+            return (None)
+        value = proc.stdout.decode().strip()
+        return (value if proc.returncode == 0 and value else None)
+
+    def _default_url(self):
+        """
+        Return the WebHDFS url(s) of the NameNode(s) configured on the
+        host, HA nameservices give one url per NameNode separated by `;`.
+        The wildcard addresses (eg. the default 0.0.0.0:9870) are refused.
+        """
+        https = (self._getconf("dfs.http.policy") or "").upper() == "HTTPS_ONLY"
+        scheme = "https" if https else "http"
+        key = "dfs.namenode.https-address" if https else "dfs.namenode.http-address"
+        # One list of candidate keys per NameNode, the first usable wins
+        candidates = [[key]]
+        nameservices = [
+            ns.strip() for ns in (self._getconf("dfs.nameservices") or "").split(",")
+            if ns.strip()
+        ]
+        if nameservices:
+            default_fs = urlparse(self._getconf("fs.defaultFS") or "").hostname
+            ns = default_fs if default_fs in nameservices else nameservices[0]
+            namenodes = [
+                nn.strip() for nn in (self._getconf("dfs.ha.namenodes.%s" % ns) or "").split(",")
+                if nn.strip()
+            ]
+            if namenodes:
+                candidates = [["%s.%s.%s" % (key, ns, nn)] for nn in namenodes]
+            else:
+                candidates = [["%s.%s" % (key, ns), key]]
+        urls = []
+        for keys in candidates:
+            for conf_key in keys:
+                address = self._getconf(conf_key)
+                host = (address or "").rsplit(":", 1)[0].strip("[]")
+                if host not in ("", "0.0.0.0", "::"):  # Unset or wildcard
+                    urls.append("%s://%s" % (scheme, address))
+                    break
+        if not urls:
+            raise HdfsUtilsError("cannot find the NameNode %s address in the hadoop "
+                                 "config, set url" % scheme)
+        return (";".join(urls))
+
+    def _connect(self, renew=False):
+        """
+        Build the client on the session cached for the NameNode(s) of
+        :url:, the param :renew: drops the cached session and opens a new
+        one.
+        """
+        key = tuple(
+            (parsed.hostname, parsed.port)
+            for parsed in (urlparse(u) for u in self.url.split(";") if u)
+        )
+        if renew or key not in self._sessions:
+            sess = Session()
+            adapter = HTTPAdapter(
+                pool_connections=1, pool_maxsize=8,
+                max_retries=Retry(connect=3, read=0, backoff_factor=0.2)
+            )
+            sess.mount("http://", adapter)
+            sess.mount("https://", adapter)
+            sess.headers["Connection"] = "keep-alive"
+            old = self._sessions.pop(key, None)
+            if old is not None:
+                old.close()
+            self._sessions[key] = sess
+        self.client = InsecureClient(self.url, session=self._sessions[key])
+
+    def _retry(self, func):
+        """
+        Return the result of :func:, it is called again once on a new
+        connection if the NameNode closed the first one.
+        """
+        try:
+            return (func())
+        except HttpConnectionError:
+            self._connect(renew=True)
+        try:
+            return (func())
+        except HttpConnectionError as e:
+            raise HdfsUtilsError("library connection error: %s" % e)
+
+    def _call(self, name, *args, **kwargs):
+        """
+        Call the client method :name: through `_retry`.
+        """
+        return (self._retry(lambda: getattr(self.client, name)(*args, **kwargs)))
+
+    def _walk(self, path, status=False):
+        """
+        Return the whole walk of :path: as a list, so all its WebHDFS
+        requests are covered by `_retry`.
+        """
+        return (self._retry(lambda: list(self.client.walk(path, status=status))))
+
+    def apply_batch(self, path, mode=None, owner=None, group=None,
+                    replication=None, recurse=None):
+        """
+        Apply all the given attributes to :path: in one call, unset ones
+        are skipped. With :recurse: the tree is walked only once for both
+        chown and chmod, the entries already up to date are left
+        untouched. Return True if at least one entry was changed.
+        """
+        written = False
+        try:
+            wanted = None if mode is None else int(mode, 8)
+            chown = owner is not None or group is not None
+            if chown or wanted is not None:
+                for target, status in self._entries(path, recurse):
+                    if chown and (owner not in (None, status["owner"]) or
+                                  group not in (None, status["group"])):
+                        self._call("set_owner", target, owner=owner, group=group)
+                        written = True
+                    if wanted is not None and int(status["permission"], 8) != wanted:
+                        self._call("set_permission", target, "%o" % wanted)
+                        written = True
+        except (HdfsError, ValueError) as e:
+            raise HdfsUtilsError("library batch error: %s" % e)
+        if replication is not None:
+            self.setrep(path, replication)
+            written = True
+        return (written)
+
+    def _entries(self, path, recurse=None):
+        """
+        Return the list of (path, FileStatus) impacted by an operation on
+        :path:, the param :recurse: adds all subfiles and subfolders.
+        """
+        entries = [(path, self._call("status", path))]
+        if recurse:
+            for (root, _), dirs, files in self._walk(path, status=True):
+                entries.extend(
+                    (posixpath.join(root, name), status)
+                    for name, status in dirs + files
+                )
+        return (entries)
+
+    def chmod(self, path, mode, recurse=None):
+        """
+        Change the :mode: of the given :path:. The param :mode: needs to
+        be a string representation of an octal number (eg. "0744")
+        """
+        self.apply_batch(path, mode=mode, recurse=recurse)
+        return (self)
+
+    def chown(self, path, owner=None, group=None, recurse=None):
+        """
+        Change the :owner: and/or :group: for the given :path:. The param
+        :recurse: apply the changes for all subfiles and subfolders inside
+        the give :path:. (should be a directory)
+        """
+        if not owner and not group:  # Nothing to change
+            return (self)
+        self.apply_batch(path, owner=owner, group=group, recurse=recurse)
+        return (self)
+
+    def mkdir(self, path, parent=False):
+        """
+        Create the directory pointed by :path:. WebHDFS always creates the
+        immediate subdirectories, the param :parent: is kept for
+        compatibility with HdfsContextCli. This method raises an
+        HdfsUtilsError if the call failed.
+        """
+        try:
+            self._call("makedirs", path)
+        except HdfsError as e:
+            raise HdfsUtilsError("library mkdir error: %s" % e)
+        return (self)
+
+    def remove(self, path, recurse=False):
+        """
+        Remove the file/directory pointed by :path:, the params :recurse:
+        allows to force delete directories and its content. Like
+        `hdfs dfs -rm`, the path is moved to the trash when
+        `fs.trash.interval` is positive in the host hadoop config. This
+        method raises an HdfsUtilsError if the call failed.
+        """
+        try:
+            interval = float(self._getconf("fs.trash.interval") or 0)
+        except ValueError:
+            interval = 0
+        try:
+            self._call("delete", path, recursive=bool(recurse),
+                       skip_trash=interval <= 0)
+        except HdfsError as e:
+            raise HdfsUtilsError("library rm error: %s" % e)
+        return (self)
+
+    def setrep(self, path, factor):
+        """
+        Set the expected replication factor of the given :path:. The param
+        :factor: is expected to be a number. Like the CLI, the factor is
+        applied recursivly on directories.
+        """
+        try:
+            status = self._call("status", path)
+            if status["type"] == "DIRECTORY":
+                targets = [
+                    posixpath.join(root, name)
+                    for root, dirs, files in self._walk(path)
+                    for name in files
+                ]
+            else:
+                targets = [path]
+            for target in targets:
+                self._call("set_replication", target, int(factor))
+        except HdfsError as e:
+            raise HdfsUtilsError("library setrep error: %s" % e)
+        return (self)
+
+    def stats(self, path):
+        """
+        Return a formatted dict that contains the status for the
+        given :path:.
+        """
+        result = {
+            "state": "absent",
+            "owner": None,
+            "group": None,
+            "replication": None,
+            "mode": None
+        }
+        try:
+            status = self._call("status", path, strict=False)
+        except HdfsError as e:
+            raise HdfsUtilsError("library stat error: %s" % e)
+        if status is None:  # No such file or directory
+            return (result)
+        result["state"] = status["type"].lower()  # FILE or DIRECTORY
+        result["owner"] = status["owner"]
+        result["group"] = status["group"]
+        result["replication"] = int(status["replication"])
+        result["mode"] = status["permission"]  # Octal string (eg. "755")
+        return (result)
+
+    def touch(self, path):
+        """
+        Create a file at the given :path:, if the file already exist it
+        updates file access and modification times. This method raises
+        an HdfsUtilsError if the call failed.
+        """
+        try:
+            if self._call("status", path, strict=False) is None:
+                self._call("write", path, data=b"")
+            else:
+                now = int(time.time() * 1000)
+                self._call("set_times", path, access_time=now, modification_time=now)
+        except HdfsError as e:
+            raise HdfsUtilsError("library touchz error: %s" % e)
+        return (self)
 
 # --------------------------------------------------------------------------- #
 # ------------------------------------------------------------- HdfsCheckMode #
@@ -188,8 +694,9 @@ class HdfsContextLib:
 
 
 """
-Neutralize a given HdfsContextCli or HdfsContextLib by replacing the "action"
- methods to handle the Ansible check mode.
+Neutralize a given HdfsContextCli or HdfsContextLib by wrapping it in a proxy
+ that only forwards `stats` and turns the "action" methods into no-ops to
+ handle the Ansible check mode. The wrapped instance is left untouched.
 """
 
 
@@ -198,29 +705,27 @@ class HdfsCheckMode:
     def __init__(self, inst):
         if not isinstance(inst, HdfsContextCli) and not isinstance(inst, HdfsContextLib):
             raise HdfsUtilsError("HdfsCheckMode expect a valid HdfsContext instance")
+        self._inst = inst
+        self.stats = inst.stats
 
-        def chmod(path, mode, recurse=None):
-            return (self)
-        setattr(inst, "chmod", chmod)
+    def apply_batch(self, path, mode=None, owner=None, group=None,
+                    replication=None, recurse=None):
+        return (False)  # Nothing is written
 
-        def chown(path, owner=None, group=None, recurse=None):
-            return (self)
-        setattr(inst, "chown", chown)
+    def chmod(self, path, mode, recurse=None):
+        return (self)
 
-        def mkdir(path, parent=False):
-            return (self)
-        setattr(inst, "mkdir", mkdir)
+    def chown(self, path, owner=None, group=None, recurse=None):
+        return (self)
 
-        def remove(path, recurse=False):
-            return (self)
-        setattr(inst, "remove", remove)
+    def mkdir(self, path, parent=False):
+        return (self)
 
-        def setrep(path, factor):
-            return (self)
-        setattr(inst, "setrep", setrep)
+    def remove(self, path, recurse=False):
+        return (self)
 
-        def touch(path):
-            return (self)
-        setattr(inst, "touch", touch)
+    def setrep(self, path, factor):
+        return (self)
 
-        return (inst)
+    def touch(self, path):
+        return (self)
@@ -0,0 +1,64 @@
+import json
+import os
+import stat
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "module_utils"))
+sys.path.insert(0, os.path.join(ROOT, "library"))
+
+import HdfsUtils  # noqa: E402
+
+# Fake `hdfs` CLI: logs its argv as one json line, then answers from the
+# json file `answers` keyed by the sub command (eg. "-stat", "getconf").
+FAKE_HDFS = """#!%(python)s
+import json, os, sys
+here = os.path.dirname(os.path.abspath(__file__))
+with open(os.path.join(here, "calls"), "a") as f:
+    f.write(json.dumps(sys.argv[1:]) + "\\n")
+with open(os.path.join(here, "answers")) as f:
+    answers = json.load(f)
+key = sys.argv[3] if sys.argv[1] == "getconf" else sys.argv[2]
+out, rc = answers.get(key, ["", 0])
+sys.stdout.write(out)
+sys.exit(rc)
+"""
+
+
+class FakeHdfs:
+
+    def __init__(self, directory):
+        self.dir = directory
+        self.path = str(directory / "hdfs")
+        self.answer({})
+
+    def answer(self, answers):
+        """
+        Set the (stdout, returncode) returned for each sub command.
+        """
+        (self.dir / "answers").write_text(json.dumps(answers))
+
+    def calls(self):
+        calls = self.dir / "calls"
+        if not calls.exists():
+            return ([])
+        return ([json.loads(line) for line in calls.read_text().splitlines()])
+
+
+@pytest.fixture
+def fake_hdfs(tmp_path, monkeypatch):
+    fake = FakeHdfs(tmp_path)
+    with open(fake.path, "w") as f:
+        f.write(FAKE_HDFS % {"python": sys.executable})
+    os.chmod(fake.path, os.stat(fake.path).st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", "%s:%s" % (tmp_path, os.environ["PATH"]))
+    return (fake)
+
+
+@pytest.fixture(autouse=True)
+def clear_stats_cache():
+    HdfsUtils.HdfsContextCli._stats_cache.clear()
+    yield
+    HdfsUtils.HdfsContextCli._stats_cache.clear()
@@ -0,0 +1,82 @@
+import sys
+import types
+
+import pytest
+
+pytest.importorskip("ansible")
+
+import HdfsUtils  # noqa: E402
+
+# Same as the `cyres` symlink described in the README
+sys.modules.setdefault("ansible.module_utils.cyres", types.ModuleType("cyres"))
+sys.modules["ansible.module_utils.cyres.HdfsUtils"] = HdfsUtils
+
+import hdfs_file  # noqa: E402
+
+
+class Failed(Exception):
+    pass
+
+
+class Module:
+
+    def fail_json(self, **kwargs):
+        raise Failed(kwargs["msg"])
+
+
+@pytest.mark.parametrize("mode, expected", [
+    (None, None),
+    (493, "755"),
+    ("0755", "0755"),
+    ("755", "755"),
+])
+def test_normalize_mode(mode, expected):
+    assert hdfs_file.normalize_mode(Module(), mode) == expected
+
+
+@pytest.mark.parametrize("mode", ["g+w", "493", "abc"])
+def test_normalize_mode_invalid(mode):
+    with pytest.raises(Failed):
+        hdfs_file.normalize_mode(Module(), mode)
+
+
+@pytest.mark.parametrize("current, wanted, modify", [
+    ("755", "0755", False),
+    ("755", "750", True),
+    (None, "750", True),
+])
+def test_should_modify_mode(current, wanted, modify):
+    params = {"mode": wanted}
+    assert hdfs_file.should_modify({"mode": current}, params, "mode") is modify
+
+
+def test_should_modify_unset():
+    assert hdfs_file.should_modify({"owner": "u"}, {"owner": None}, "owner") is False
+
+
+def test_resolv_states_projects_fresh_directory(fake_hdfs):
+    context = HdfsUtils.HdfsContextCli(command=fake_hdfs.path)
+    status = {"state": "absent", "owner": None, "group": None,
+              "replication": None, "mode": None}
+    params = {"state": "directory", "path": "/d"}
+    status = hdfs_file.resolv_states(Module(), params, context, status)
+    assert status["state"] == "directory"
+    assert fake_hdfs.calls() == [["dfs", "-mkdir", "-p", "/d"]]
+
+
+def test_resolv_states_touch_keeps_attributes(fake_hdfs):
+    context = HdfsUtils.HdfsContextCli(command=fake_hdfs.path)
+    status = {"state": "file", "owner": "u", "group": "g",
+              "replication": 3, "mode": "644"}
+    params = {"state": "touch", "path": "/f"}
+    status = hdfs_file.resolv_states(Module(), params, context, status)
+    assert status == {"state": "file", "owner": "u", "group": "g",
+                      "replication": 3, "mode": "644"}
+
+
+def test_resolv_states_absent_to_file_fails(fake_hdfs):
+    context = HdfsUtils.HdfsContextCli(command=fake_hdfs.path)
+    with pytest.raises(Failed):
+        hdfs_file.resolv_states(Module(), {"state": "file", "path": "/f"},
+                                context, {"state": "absent"})
+    assert fake_hdfs.calls() == []
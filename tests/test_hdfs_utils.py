@@ -0,0 +1,146 @@
+import pytest
+
+from HdfsUtils import (
+    HdfsCheckMode,
+    HdfsContextCli,
+    HdfsUtilsError,
+    _symbolic_to_octal
+)
+
+LS_R = (
+    "drwxr-xr-x   - u g          0 2017-05-09 14:17 /t/a\n"
+    "-rw-r--r--   3 u g          0 2017-05-09 14:17 /t/a/my file\n"
+    "-rwxr-xr-x   3 x g          0 2017-05-09 14:17 /t/b\n"
+)
+
+
+def context(fake_hdfs):
+    return (HdfsContextCli(command=fake_hdfs.path))
+
+
+@pytest.mark.parametrize("owner, group, target", [
+    (None, None, None),
+    ("u", None, "u"),
+    (None, "g", ":g"),
+    ("u", "g", "u:g"),
+])
+def test_chown_target(fake_hdfs, owner, group, target):
+    context(fake_hdfs).chown("/p", owner=owner, group=group)
+    expected = [] if target is None else [["dfs", "-chown", target, "/p"]]
+    assert fake_hdfs.calls() == expected
+
+
+@pytest.mark.parametrize("perms, mode", [
+    ("drwxr-xr-x", 0o755),
+    ("-rw-r--r--+", 0o644),
+    ("drwxrwxrwt", 0o1777),
+    ("drwxrwxrwT", 0o1776),
+    ("----------", 0o0),
+])
+def test_symbolic_to_octal(perms, mode):
+    assert _symbolic_to_octal(perms) == mode
+
+
+def test_stats_file(fake_hdfs):
+    fake_hdfs.answer({"-stat": ["regular file[SEP]u[SEP]g[SEP]3[SEP]644\n", 0]})
+    assert context(fake_hdfs).stats("/f") == {
+        "state": "file", "owner": "u", "group": "g",
+        "replication": 3, "mode": "644"
+    }
+
+
+def test_stats_absent(fake_hdfs):
+    fake_hdfs.answer({"-stat": ["", 1]})
+    assert context(fake_hdfs).stats("/f")["state"] == "absent"
+
+
+def test_stats_cache(fake_hdfs):
+    fake_hdfs.answer({"-stat": ["directory[SEP]u[SEP]g[SEP]0[SEP]755\n", 0]})
+    ctx = context(fake_hdfs)
+    ctx.stats("/a")
+    ctx.stats("/a/")
+    assert len(fake_hdfs.calls()) == 1
+    ctx.touch("/a/f")  # Invalidate the parent
+    ctx.stats("/a")
+    assert [call[1] for call in fake_hdfs.calls()] == ["-stat", "-touchz", "-stat"]
+
+
+def test_stats_cache_per_command(fake_hdfs):
+    fake_hdfs.answer({"-stat": ["directory[SEP]u[SEP]g[SEP]0[SEP]755\n", 0]})
+    context(fake_hdfs).stats("/a")
+    HdfsContextCli(command="/bin/false").stats("/a")
+    assert len(fake_hdfs.calls()) == 1
+    assert HdfsContextCli(command="/bin/false").stats("/a")["state"] == "absent"
+
+
+def test_recursive_batch_lists_once(fake_hdfs):
+    fake_hdfs.answer({
+        "-stat": ["directory[SEP]u[SEP]g[SEP]0[SEP]755\n", 0],
+        "-ls": [LS_R, 0],
+    })
+    assert context(fake_hdfs).apply_batch("/t", mode="755", owner="u", recurse=True)
+    calls = fake_hdfs.calls()
+    assert [call[1] for call in calls].count("-ls") == 1
+    assert [call[1] for call in calls].count("-stat") == 1
+    assert sorted(call for call in calls if call[1] in ("-chmod", "-chown")) == [
+        ["dfs", "-chmod", "755", "/t/a/my file"],
+        ["dfs", "-chown", "u", "/t/b"],
+    ]
+
+
+def test_recursive_batch_up_to_date(fake_hdfs):
+    fake_hdfs.answer({
+        "-stat": ["directory[SEP]u[SEP]g[SEP]0[SEP]755\n", 0],
+        "-ls": [LS_R, 0],
+    })
+    assert not context(fake_hdfs).apply_batch("/t", group="g", recurse=True)
+    assert [call[1] for call in fake_hdfs.calls()] == ["-stat", "-ls"]
+
+
+def test_chmod_invalid_mode(fake_hdfs):
+    with pytest.raises(HdfsUtilsError):
+        context(fake_hdfs).chmod("/p", "g+w")
+    assert fake_hdfs.calls() == []
+
+
+def test_check_mode(fake_hdfs):
+    fake_hdfs.answer({"-stat": ["regular file[SEP]u[SEP]g[SEP]3[SEP]644\n", 0]})
+    ctx = HdfsCheckMode(context(fake_hdfs))
+    assert ctx.stats("/f")["state"] == "file"
+    assert ctx.apply_batch("/f", mode="700", owner="o") is False
+    ctx.chmod("/f", "700").chown("/f", "o").mkdir("/d").remove("/f").setrep("/f", 2).touch("/f")
+    assert [call[1] for call in fake_hdfs.calls()] == ["-stat"]
+
+
+def test_check_mode_expects_context():
+    with pytest.raises(HdfsUtilsError):
+        HdfsCheckMode(object())
+
+
+@pytest.mark.parametrize("conf, url", [
+    ({"dfs.namenode.http-address": "nn:9870"}, "http://nn:9870"),
+    ({"dfs.http.policy": "HTTPS_ONLY", "dfs.namenode.https-address": "nn:9871"},
+     "https://nn:9871"),
+    ({"dfs.namenode.http-address": "0.0.0.0:9870", "dfs.nameservices": "a,b",
+      "fs.defaultFS": "hdfs://b", "dfs.ha.namenodes.b": "nn1,nn2",
+      "dfs.namenode.http-address.b.nn1": "h1:9870",
+      "dfs.namenode.http-address.b.nn2": "h2:9870"},
+     "http://h1:9870;http://h2:9870"),
+    ({"dfs.namenode.http-address": "0.0.0.0:9870", "dfs.nameservices": "a",
+      "dfs.namenode.http-address.a": "h:9870"}, "http://h:9870"),
+])
+def test_lib_default_url(fake_hdfs, monkeypatch, conf, url):
+    pytest.importorskip("hdfs")
+    import HdfsUtils
+    monkeypatch.setattr(HdfsUtils, "_HDFS_BIN", fake_hdfs.path)
+    fake_hdfs.answer({key: [value + "\n", 0] for key, value in conf.items()})
+    assert HdfsUtils.HdfsContextLib().url == url
+
+
+def test_lib_default_url_wildcard(fake_hdfs, monkeypatch):
+    pytest.importorskip("hdfs")
+    import HdfsUtils
+    monkeypatch.setattr(HdfsUtils, "_HDFS_BIN", fake_hdfs.path)
+    fake_hdfs.answer({"dfs.namenode.http-address": ["0.0.0.0:9870\n", 0]})
+    with pytest.raises(HdfsUtilsError):
+        HdfsUtils.HdfsContextLib()